@@ -1,67 +1,522 @@
 import os
+import errno
 import shutil
 import hashlib
+import mmap
+import ctypes
+import ctypes.util
+import sqlite3
 from tkinter import (
     Tk, filedialog, Label, Button, Text, END, ttk,
-    messagebox, StringVar, BooleanVar, Checkbutton, Entry
+    messagebox, StringVar, BooleanVar, Checkbutton, Entry, Radiobutton
 )
 from pathlib import Path
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from urllib.request import pathname2url
 import threading
+import multiprocessing
+import queue
+import time
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+DEFAULT_HASH = "blake3" if blake3 else "sha256"
+# hashlib and blake3 release the GIL while hashing, so threads overlap both
+# the reads and the hashing; the cap keeps spinning disks from thrashing.
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Past this many bytes to read, content checks move to one process per core.
+PROCESS_HASH_THRESHOLD = 100 * 1024 * 1024
+COMPARE_BLOCK_SIZE = 1 << 20
+# Sync progress reaches the Tk log every LOG_BATCH_SIZE files or LOG_FLUSH_SECONDS.
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_SECONDS = 1.0
+# How far the backup/mkdir stage may run ahead of the copy stage.
+SYNC_QUEUE_SIZE = 8
+# Below this a single read() is cheaper than a mapping or block buffers.
+MMAP_THRESHOLD = 64 * 1024
+
+# --------- Fast Metadata (Linux statx) --------- #
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x1
+STATX_MTIME = 0x40
+STATX_SIZE = 0x200
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_int64), ("tv_nsec", ctypes.c_uint32),
+                ("__reserved", ctypes.c_int32)]
+
+class _Statx(ctypes.Structure):
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32), ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64), ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32), ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16), ("__spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64), ("stx_size", ctypes.c_uint64),
+        ("stx_blocks", ctypes.c_uint64), ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", _StatxTimestamp), ("stx_btime", _StatxTimestamp),
+        ("stx_ctime", _StatxTimestamp), ("stx_mtime", _StatxTimestamp),
+        ("stx_rdev_major", ctypes.c_uint32), ("stx_rdev_minor", ctypes.c_uint32),
+        ("stx_dev_major", ctypes.c_uint32), ("stx_dev_minor", ctypes.c_uint32),
+        ("__spare2", ctypes.c_uint64 * 14),
+    ]
+
+# Only the fields the planner reads; matches the os.stat_result attribute names.
+FastStat = namedtuple("FastStat", ["st_size", "st_mtime", "st_mtime_ns"])
+
+_statx_func = None
+_statx_checked = False
+
+_statx_lock = threading.Lock()
+
+def _get_statx():
+    # Resolved once: needs glibc >= 2.28 and a kernel >= 4.11. Both folder
+    # walks may get here at the same time, hence the lock.
+    global _statx_func, _statx_checked
+    with _statx_lock:
+        if not _statx_checked:
+            _statx_checked = True
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+                func = libc.statx
+            except (OSError, AttributeError, TypeError):
+                return None
+            func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int,
+                             ctypes.c_uint, ctypes.POINTER(_Statx)]
+            func.restype = ctypes.c_int
+            buf = _Statx()
+            if func(AT_FDCWD, b".", AT_STATX_DONT_SYNC, STATX_TYPE, ctypes.byref(buf)) == 0:
+                _statx_func = func
+    return _statx_func
+
+def statx_fast(path):
+    # AT_STATX_DONT_SYNC lets network filesystems answer from their cached
+    # attributes instead of round-tripping to the server for every file.
+    # On local disks plain DirEntry.stat() is cheaper, so this is opt-in.
+    func = _get_statx()
+    if func is None:
+        return None
+    buf = _Statx()
+    if func(AT_FDCWD, os.fsencode(path), AT_STATX_DONT_SYNC,
+            STATX_TYPE | STATX_SIZE | STATX_MTIME, ctypes.byref(buf)) != 0:
+        return None
+    # The filesystem may leave out fields it couldn't fill.
+    if buf.stx_mask & (STATX_SIZE | STATX_MTIME) != STATX_SIZE | STATX_MTIME:
+        return None
+    mtime = buf.stx_mtime
+    mtime_ns = mtime.tv_sec * 1_000_000_000 + mtime.tv_nsec
+    return FastStat(buf.stx_size, mtime_ns / 1e9, mtime_ns)
+
+# --------- Hash Cache --------- #
+CACHE_DB_NAME = ".sync_cache.db"
+# The database plus SQLite's sidecar files; only ever at a folder's root.
+CACHE_DB_FILES = {CACHE_DB_NAME + suffix for suffix in ("", "-journal", "-wal", "-shm")}
+
+def _open_hash_cache(folder):
+    conn = sqlite3.connect(os.path.join(folder, CACHE_DB_NAME))
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS hashes ("
+        "relpath TEXT, algorithm TEXT, size INTEGER, mtime_ns INTEGER, digest BLOB, "
+        "PRIMARY KEY (relpath, algorithm))"
+    )
+    return conn
+
+def load_hash_cache(folder, algorithm=DEFAULT_HASH):
+    # Returns {rel_path: (size, mtime_ns, hex_digest)}. Opened read-only so
+    # comparing never creates the database; a missing or unreadable one
+    # simply means no cache.
+    db_path = os.path.join(folder, CACHE_DB_NAME)
+    if not os.path.exists(db_path):
+        return {}
+    # SQLite rejects a URI authority, so UNC paths (//server/share/...) must
+    # come out as file:////server/share/... rather than file://server/...
+    db_url = pathname2url(os.path.abspath(db_path))
+    if db_url.startswith("//") and not db_url.startswith("///"):
+        db_url = "//" + db_url
+    db_uri = "file:" + db_url + "?mode=ro"
+    try:
+        conn = sqlite3.connect(db_uri, uri=True)
+        try:
+            rows = conn.execute(
+                "SELECT relpath, size, mtime_ns, digest FROM hashes WHERE algorithm = ?",
+                (algorithm,),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return {}
+    return {rel: (size, mtime_ns, digest.hex()) for rel, size, mtime_ns, digest in rows}
+
+def save_hash_cache(folder, entries, algorithm=DEFAULT_HASH):
+    # entries: iterable of (rel_path, stat_result, hex_digest), one transaction.
+    rows = [(rel, algorithm, st.st_size, st.st_mtime_ns, bytes.fromhex(digest))
+            for rel, st, digest in entries]
+    if not rows:
+        return
+    try:
+        conn = _open_hash_cache(folder)
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+def cached_digest(cache, rel_path, st):
+    entry = cache.get(rel_path)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+    return None
 
 # --------- File Comparison Functions --------- #
-def get_file_hash(file_path):
-    hash_sha256 = hashlib.sha256()
+def get_file_hash(file_path, algorithm=DEFAULT_HASH):
+    if algorithm == "blake3":
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher.hexdigest()
+
+    # OpenSSL picks its SHA-NI / AVX2 kernel at runtime; handing it the whole
+    # mapped file in one update() keeps it in that kernel end to end.
+    hash_sha256 = hashlib.new("sha256", usedforsecurity=False)
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            hash_sha256.update(chunk)
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            hash_sha256.update(f.read())
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                hash_sha256.update(mm)
     return hash_sha256.hexdigest()
 
-def list_files(folder):
-    file_dict = {}
-    for root, _, files in os.walk(folder):
-        for file in files:
-            abs_path = Path(root) / file
-            rel_path = abs_path.relative_to(folder)
-            file_dict[str(rel_path)] = abs_path
-    return file_dict
-
-def get_sync_actions(folder1, folder2, use_hash=False):
-    files1 = list_files(folder1)
-    files2 = list_files(folder2)
-    all_keys = set(files1.keys()).union(files2.keys())
-
-    actions = []
-
-    for rel_path in all_keys:
-        f1 = files1.get(rel_path)
-        f2 = files2.get(rel_path)
-
-        if f1 and not f2:
-            actions.append(("copy", f1, Path(folder2) / rel_path))
-        elif f2 and not f1:
-            actions.append(("copy", f2, Path(folder1) / rel_path))
-        elif f1 and f2:
-            if use_hash:
-                h1 = get_file_hash(f1)
-                h2 = get_file_hash(f2)
-                if h1 != h2:
-                    actions.append(("update", f1, f2))
-                    actions.append(("update", f2, f1))
-            else:
-                if f1.stat().st_mtime > f2.stat().st_mtime:
-                    actions.append(("update", f1, f2))
-                elif f2.stat().st_mtime > f1.stat().st_mtime:
-                    actions.append(("update", f2, f1))
+def new_hasher(algorithm=DEFAULT_HASH):
+    if algorithm == "blake3":
+        return blake3.blake3()
+    return hashlib.new("sha256", usedforsecurity=False)
+
+def compare_file_contents(path1, path2, algorithm=DEFAULT_HASH):
+    # Reads both files side by side and stops at the first differing block.
+    # Identical blocks are hashed once, so a match also yields the digest
+    # both files share; a mismatch returns None.
+    hasher = new_hasher(algorithm)
+    with open(path1, "rb") as f1, open(path2, "rb") as f2:
+        size = os.fstat(f1.fileno()).st_size
+        if os.fstat(f2.fileno()).st_size != size:
+            return None
+        if size >= MMAP_THRESHOLD:
+            # Buffers sized to the file, reused for every full block.
+            block_size = min(COMPARE_BLOCK_SIZE, size)
+            buf1 = bytearray(block_size)
+            buf2 = bytearray(block_size)
+            for _ in range(size // block_size):
+                if f1.readinto(buf1) != block_size or f2.readinto(buf2) != block_size:
+                    return None
+                # bytearray == bytearray is a straight memcmp
+                if buf1 != buf2:
+                    return None
+                hasher.update(buf1)
+        tail = f1.read()
+        if tail != f2.read():
+            return None
+        hasher.update(tail)
+    return hasher.hexdigest()
+
+def check_pair(f1, f2, digest1=None, digest2=None, algorithm=DEFAULT_HASH):
+    # Fills in whichever digests the cache could not supply. Returns the pair
+    # of digests; (None, None) means the files differ and neither was hashed.
+    if digest1 is None and digest2 is None:
+        digest = compare_file_contents(f1, f2, algorithm)
+        return digest, digest
+    if digest1 is None:
+        digest1 = get_file_hash(f1, algorithm)
+    elif digest2 is None:
+        digest2 = get_file_hash(f2, algorithm)
+    return digest1, digest2
+
+def scan_files(path, rel_prefix=""):
+    # Unreadable folders (lost+found, System Volume Information, ...) are
+    # skipped, as os.walk does by default.
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if not rel_prefix and entry.name in CACHE_DB_FILES:
+                continue
+            rel_path = rel_prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path, rel_path + os.sep)
+            elif entry.is_file():
+                yield rel_path, entry
+
+def list_files(folder, network_metadata=False):
+    # Keep each file's stat next to its path so the planner never stats twice.
+    # Paths stay plain strings all the way through planning and copying.
+    if network_metadata:
+        return {
+            rel_path: (entry.path, statx_fast(entry.path) or entry.stat())
+            for rel_path, entry in scan_files(folder)
+        }
+    return {rel_path: (entry.path, entry.stat()) for rel_path, entry in scan_files(folder)}
+
+# Planned actions as parallel lists of plain strings rather than one
+# tuple per file: kinds ("copy"/"update"), source paths, destination paths.
+SyncActions = namedtuple("SyncActions", ["kinds", "srcs", "dsts"])
+
+def new_actions():
+    return SyncActions([], [], [])
+
+def add_action(actions, kind, src, dst):
+    actions.kinds.append(kind)
+    actions.srcs.append(src)
+    actions.dsts.append(dst)
+
+def plan_mtime_updates(keys, files1, files2, actions):
+    # Newer side wins.
+    for rel_path in keys:
+        f1, s1 = files1[rel_path]
+        f2, s2 = files2[rel_path]
+        if s1.st_mtime_ns > s2.st_mtime_ns:
+            add_action(actions, "update", f1, f2)
+        elif s2.st_mtime_ns > s1.st_mtime_ns:
+            add_action(actions, "update", f2, f1)
+
+def get_sync_actions(folder1, folder2, use_hash=False, algorithm=DEFAULT_HASH,
+                     network_metadata=False):
+    # Walk both trees at once; scandir/stat release the GIL, so on network
+    # drives one walk's round-trips hide behind the other's.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future1 = executor.submit(list_files, folder1, network_metadata)
+        future2 = executor.submit(list_files, folder2, network_metadata)
+        files1 = future1.result()
+        files2 = future2.result()
+
+    folder1 = os.fspath(folder1)
+    folder2 = os.fspath(folder2)
+    join = os.path.join
+    actions = new_actions()
+    for src_files, dst_folder, rel_paths in ((files1, folder2, files1.keys() - files2.keys()),
+                                             (files2, folder1, files2.keys() - files1.keys())):
+        actions.kinds.extend(["copy"] * len(rel_paths))
+        actions.srcs.extend([src_files[rel_path][0] for rel_path in rel_paths])
+        actions.dsts.extend([join(dst_folder, rel_path) for rel_path in rel_paths])
+
+    both = files1.keys() & files2.keys()
+    if not use_hash:
+        plan_mtime_updates(both, files1, files2, actions)
+        return actions
+
+    hash_pairs = []
+    cache1 = load_hash_cache(folder1, algorithm)
+    cache2 = load_hash_cache(folder2, algorithm)
+    for rel_path in both:
+        f1, s1 = files1[rel_path]
+        f2, s2 = files2[rel_path]
+        # Different sizes already prove the contents differ.
+        if s1.st_size != s2.st_size:
+            add_action(actions, "update", f1, f2)
+            add_action(actions, "update", f2, f1)
+        else:
+            d1 = cached_digest(cache1, rel_path, s1)
+            d2 = cached_digest(cache2, rel_path, s2)
+            if d1 is None or d2 is None:
+                hash_pairs.append((rel_path, f1, f2, s1, s2, d1, d2))
+            elif d1 != d2:
+                add_action(actions, "update", f1, f2)
+                add_action(actions, "update", f2, f1)
+
+    if hash_pairs:
+        _, paths1, paths2, _, _, known1, known2 = zip(*hash_pairs)
+        check = partial(check_pair, algorithm=algorithm)
+        workers = min(os.cpu_count() or 1, len(hash_pairs))
+        # Only sides without a cached digest get read.
+        total_bytes = sum((s1.st_size if d1 is None else 0) + (s2.st_size if d2 is None else 0)
+                          for _, _, _, s1, s2, d1, d2 in hash_pairs)
+        if workers > 1 and total_bytes > PROCESS_HASH_THRESHOLD:
+            # Threads stop scaling once many cores are hashing; spawn (not fork)
+            # keeps the Tk process and its threads out of the workers.
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            chunksize = max(1, len(hash_pairs) // (workers * 4))
+        else:
+            executor = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+            chunksize = 1
+        with executor:
+            results = list(executor.map(check, paths1, paths2, known1, known2,
+                                        chunksize=chunksize))
+
+        new1, new2 = [], []
+        for (rel_path, f1, f2, s1, s2, d1, d2), (h1, h2) in zip(hash_pairs, results):
+            if h1 is None or h1 != h2:
+                add_action(actions, "update", f1, f2)
+                add_action(actions, "update", f2, f1)
+            if h1 is not None and d1 is None:
+                new1.append((rel_path, s1, h1))
+            if h2 is not None and d2 is None:
+                new2.append((rel_path, s2, h2))
+        save_hash_cache(folder1, new1, algorithm)
+        save_hash_cache(folder2, new2, algorithm)
     return actions
 
+# errnos meaning "this syscall can't copy this pair", not a real I/O failure.
+_FAST_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                           errno.EBADF, errno.EPERM, errno.ENOTSOCK}
+
+def _copy_file_range(src, dst):
+    # Data moves inside the kernel; on Btrfs/XFS it becomes a reflink.
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copystat(src, dst)
+
+def _sendfile_copy(src, dst):
+    # Still zero-copy, and unlike older copy_file_range it works across mounts.
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+    shutil.copystat(src, dst)
+
+def fast_copy(src, dst):
+    for name, copy in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile_copy)):
+        if not hasattr(os, name):
+            continue
+        try:
+            copy(src, dst)
+            return
+        except OSError as e:
+            if e.errno not in _FAST_COPY_UNSUPPORTED:
+                raise
+    shutil.copy2(src, dst)
+
+def make_directories(actions):
+    # Creates every destination folder (and .backup for updates) once up
+    # front instead of a mkdir per file; returns the set of folders made.
+    needed = set()
+    for kind, dst in zip(actions.kinds, actions.dsts):
+        parent = os.path.dirname(dst)
+        needed.add(parent)
+        if kind == "update":
+            needed.add(os.path.join(parent, ".backup"))
+    for folder in sorted(needed):
+        os.makedirs(folder, exist_ok=True)
+    return needed
+
+def _move_to_backup(dst, backup_path):
+    # .backup sits next to dst, so this is one rename(2); only a bind mount
+    # between the two can force the slower copy-and-delete.
+    try:
+        os.replace(dst, backup_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(dst, backup_path)
+
+def prepare_destination(dst, made_dirs=frozenset()):
+    # Returns the .bak path when an existing dst was moved aside, else None.
+    dst = os.fspath(dst)
+    parent, name = os.path.split(dst)
+    backup_folder = os.path.join(parent, ".backup")
+    backup_path = os.path.join(backup_folder, name + ".bak")
+    moved = None
+    if backup_folder in made_dirs:
+        try:
+            _move_to_backup(dst, backup_path)
+            moved = backup_path
+        except FileNotFoundError:
+            pass
+    elif os.path.lexists(dst):
+        os.makedirs(backup_folder, exist_ok=True)
+        _move_to_backup(dst, backup_path)
+        moved = backup_path
+    if parent not in made_dirs:
+        os.makedirs(parent, exist_ok=True)
+    return moved
+
 def backup_and_copy(src, dst):
-    dst = Path(dst)
-    if dst.exists():
-        backup_folder = dst.parent / ".backup"
-        backup_folder.mkdir(exist_ok=True)
-        shutil.move(str(dst), str(backup_folder / (dst.name + ".bak")))
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(str(src), str(dst))
+    prepare_destination(dst)
+    fast_copy(os.fspath(src), os.fspath(dst))
+
+def verify_copy(src, dst):
+    return get_file_hash(src, "sha256") == get_file_hash(dst, "sha256")
+
+def run_sync_pipeline(actions, on_copied, verify=False):
+    # A background thread backs up and creates each destination's folder
+    # while this thread copies, so metadata work overlaps the data transfer.
+    prepared = queue.Queue(maxsize=SYNC_QUEUE_SIZE)
+    pending_reads = Counter()
+    reads_done = threading.Condition()
+    stop = threading.Event()
+    failure = []
+    # Destinations moved into .backup whose copy hasn't finished yet.
+    backed_up = {}
+    made_dirs = make_directories(actions)
+    srcs, dsts = actions.srcs, actions.dsts
+
+    def prepare():
+        try:
+            for i in range(len(srcs)):
+                # Hash mode queues both directions for a pair; never move a
+                # file into .backup while an earlier copy still reads it.
+                with reads_done:
+                    reads_done.wait_for(lambda: stop.is_set() or not pending_reads[dsts[i]])
+                    if stop.is_set():
+                        return
+                    pending_reads[srcs[i]] += 1
+                moved = prepare_destination(dsts[i], made_dirs)
+                if moved:
+                    backed_up[i] = moved
+                prepared.put(i)
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            prepared.put(None)
+
+    preparer = threading.Thread(target=prepare, daemon=True)
+    preparer.start()
+    try:
+        while (i := prepared.get()) is not None:
+            src = srcs[i]
+            fast_copy(src, dsts[i])
+            backed_up.pop(i, None)
+            # Verify before releasing src: a later action may back it up.
+            verified = verify_copy(src, dsts[i]) if verify else None
+            with reads_done:
+                pending_reads[src] -= 1
+                reads_done.notify()
+            on_copied(i, verified)
+    except BaseException:
+        stop.set()
+        with reads_done:
+            reads_done.notify()
+        while prepared.get() is not None:
+            pass
+        # The preparer has stopped; put back every destination it moved
+        # aside whose copy never completed, so a failed sync loses nothing.
+        for i, backup_path in backed_up.items():
+            try:
+                os.replace(backup_path, dsts[i])
+            except OSError:
+                pass
+        raise
+    preparer.join()
+    if failure:
+        raise failure[0]
 
 # --------- GUI Functions --------- #
 def browse_folder(var):
@@ -69,14 +524,47 @@ def browse_folder(var):
     if path:
         var.set(path)
 
-def sync_folders(actions, progress_bar, log_area):
-    total = len(actions)
-    for i, (action, src, dst) in enumerate(actions):
-        backup_and_copy(src, dst)
-        log_area.insert(END, f"{action.upper()}: {src} -> {dst}\n")
-        progress_bar["value"] = ((i + 1) / total) * 100
-        root.update_idletasks()
-    messagebox.showinfo("Done", "Synchronization complete!")
+def format_actions(actions, indices=None):
+    kinds, srcs, dsts = actions
+    if indices is None:
+        indices = range(len(kinds))
+    return "".join(f"{kinds[i].upper()}: {srcs[i]} -> {dsts[i]}\n" for i in indices)
+
+def sync_folders(actions, progress_bar, log_area, verify=False):
+    total = len(actions.kinds)
+    copied = 0
+    pending = []
+    mismatched = []
+    last_flush = time.monotonic()
+
+    def show_progress(text, value):
+        log_area.insert(END, text)
+        progress_bar["value"] = value
+
+    def flush():
+        nonlocal last_flush
+        root.after(0, show_progress, format_actions(actions, pending), (copied / total) * 100)
+        pending.clear()
+        last_flush = time.monotonic()
+
+    def on_copied(i, verified):
+        # Runs on the worker thread; Tk widgets are only touched via after(),
+        # and in batches so the Text widget isn't re-laid out per file.
+        nonlocal copied
+        copied += 1
+        if verified is False:
+            mismatched.append(actions.dsts[i])
+        pending.append(i)
+        if len(pending) >= LOG_BATCH_SIZE or time.monotonic() - last_flush >= LOG_FLUSH_SECONDS:
+            flush()
+
+    run_sync_pipeline(actions, on_copied, verify)
+    flush()
+    if mismatched:
+        root.after(0, messagebox.showwarning, "Verification failed",
+                   "SHA-256 mismatch after copying:\n" + "\n".join(mismatched[:20]))
+    else:
+        root.after(0, messagebox.showinfo, "Done", "Synchronization complete!")
 
 def start_sync():
     folder1 = folder1_path.get()
@@ -90,49 +578,57 @@ def start_sync():
         messagebox.showerror("Invalid paths", f"One or both paths are invalid:\n{folder1}\n{folder2}")
         return
 
-    actions = get_sync_actions(folder1, folder2, use_hash.get())
+    actions = get_sync_actions(folder1, folder2, use_hash.get(), hash_algorithm.get(),
+                               network_metadata.get())
     log_area.delete("1.0", END)
 
-    if not actions:
+    if not actions.kinds:
         log_area.insert(END, "✅ Folders are already in sync.\n")
         return
 
-    log_area.insert(END, "📝 Planned Actions:\n")
-    for act, src, dst in actions:
-        log_area.insert(END, f"{act.upper()}: {src} -> {dst}\n")
+    log_area.insert(END, "📝 Planned Actions:\n" + format_actions(actions))
 
     confirm = messagebox.askyesno("Confirm", "Proceed with synchronization?")
     if confirm:
-        threading.Thread(target=sync_folders, args=(actions, progress_bar, log_area)).start()
+        threading.Thread(target=sync_folders, args=(actions, progress_bar, log_area, verify_copies.get())).start()
 
 # --------- GUI Setup --------- #
-root = Tk()
-root.title("Dev's Robust Folder Comparison and Sync Tool")
-root.geometry("780x600")
-
-folder1_path = StringVar()
-folder2_path = StringVar()
-use_hash = BooleanVar()
+if __name__ == "__main__":
+    root = Tk()
+    root.title("Dev's Robust Folder Comparison and Sync Tool")
+    root.geometry("780x600")
 
-Label(root, text="📁 Select Folder 1:").pack()
-entry1 = Entry(root, textvariable=folder1_path, width=90)
-entry1.pack()
-Button(root, text="Browse", command=lambda: browse_folder(folder1_path)).pack(pady=(0, 10))
+    folder1_path = StringVar()
+    folder2_path = StringVar()
+    use_hash = BooleanVar()
+    verify_copies = BooleanVar()
+    network_metadata = BooleanVar()
+    hash_algorithm = StringVar(value=DEFAULT_HASH)
 
-Label(root, text="📁 Select Folder 2:").pack()
-entry2 = Entry(root, textvariable=folder2_path, width=90)
-entry2.pack()
-Button(root, text="Browse", command=lambda: browse_folder(folder2_path)).pack(pady=(0, 10))
+    Label(root, text="📁 Select Folder 1:").pack()
+    entry1 = Entry(root, textvariable=folder1_path, width=90)
+    entry1.pack()
+    Button(root, text="Browse", command=lambda: browse_folder(folder1_path)).pack(pady=(0, 10))
 
-Checkbutton(root, text="Use SHA256 hash (slower but more accurate)", variable=use_hash).pack(pady=5)
+    Label(root, text="📁 Select Folder 2:").pack()
+    entry2 = Entry(root, textvariable=folder2_path, width=90)
+    entry2.pack()
+    Button(root, text="Browse", command=lambda: browse_folder(folder2_path)).pack(pady=(0, 10))
 
-Button(root, text="🔄 Compare and Sync", command=start_sync).pack(pady=5)
+    Checkbutton(root, text="Compare by content hash (slower but more accurate)", variable=use_hash).pack(pady=5)
+    Radiobutton(root, text="SHA-256 (matches external checksums)", variable=hash_algorithm, value="sha256").pack()
+    Radiobutton(root, text="BLAKE3 (faster)", variable=hash_algorithm, value="blake3",
+                state="normal" if blake3 else "disabled").pack(pady=(0, 5))
+    Checkbutton(root, text="Verify copies with SHA-256 after syncing", variable=verify_copies).pack(pady=(0, 5))
+    Checkbutton(root, text="Network / cloud folders: use cached metadata (Linux)",
+                variable=network_metadata).pack(pady=(0, 5))
 
-progress_bar = ttk.Progressbar(root, orient="horizontal", length=700, mode="determinate")
-progress_bar.pack(pady=10)
+    Button(root, text="🔄 Compare and Sync", command=start_sync).pack(pady=5)
 
-log_area = Text(root, height=20, width=100)
-log_area.pack(pady=5)
+    progress_bar = ttk.Progressbar(root, orient="horizontal", length=700, mode="determinate")
+    progress_bar.pack(pady=10)
 
-root.mainloop()
+    log_area = Text(root, height=20, width=100)
+    log_area.pack(pady=5)
 
+    root.mainloop()